@@ -4,7 +4,7 @@ Configuration module for the Zotero item date update process.
 This module contains the configuration settings required for updating the 'dateAdded' field of a specific Zotero item in the SQLite database. It loads sensitive configuration data from environment variables and defines key parameters such as the Zotero database path, the new date to set for the item, and the title of the item to search for.
 
 Usage:
-    The `config` dictionary is used by the `ZoteroInfoUpdate` class to perform database operations, such as connecting to the Zotero SQLite database and updating the 'dateAdded' field for a specific item.
+    The `get_config()` function returns the configuration dictionary used by the `ZoteroInfoUpdate` class to perform database operations, such as connecting to the Zotero SQLite database and updating the 'dateAdded' field for a specific item.
 
 Manual Update Section:
     - `TITLE_NAME`: The title of the Zotero item to search for (must be updated manually).
@@ -13,24 +13,23 @@ Manual Update Section:
     These parameters can be customized for each update operation.
 
 Environment Variables:
-    - `DB_PATH`: The path to the Zotero SQLite database. This is loaded from the environment variable `DB_PATH`.
+    - `DB_PATH`: The path to the Zotero SQLite database. This is loaded from the environment variable `DB_PATH`, after reading the `.env` file on the first call to `get_config()`.
 
-Configuration Dictionary (`config`):
+Configuration Dictionary (returned by `get_config()`, also importable as `config`):
     The configuration dictionary contains:
     - `db_path`: The path to the Zotero SQLite database, loaded from the environment.
     - `new_date_added`: The new date to update in the database.
     - `title_name`: The title of the item to search for in the database.
 
 Example:
-    - To use this configuration, ensure that `DB_PATH` is set in your environment, and then the `config` dictionary will be populated for use by the main update script.
+    - To use this configuration, ensure that `DB_PATH` is set in your environment or `.env` file, and then call `get_config()` to obtain the dictionary for use by the main update script.
 
 """  # pylint: disable=line-too-long
 
+import functools
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
-
 # ---------------------------------------MANUAL UPDATE: Start---------------------------------------
 # Specify the title name to search
 TITLE_NAME = (
@@ -46,13 +45,31 @@ TITLE_NAME = (
 NEW_DATE_ADDED = "2024-11-30 09:57:32"  # UTC time = GMT+7 - 7hours
 # ---------------------------------------MANUAL UPDATE: End---------------------------------------
 
-# Specify the path to your zotero.sqlite file
-DB_PATH = os.getenv("DB_PATH")
 
+@functools.lru_cache(maxsize=None)
+def get_config():
+    """
+    Builds the configuration dictionary for dependency injection.
+
+    The `.env` file is read on the first call only; later calls return the cached dictionary.
+
+    Returns:
+        dict: The configuration with `db_path`, `new_date_added` and `title_name`.
+    """
+
+    load_dotenv()
+
+    return {
+        # Specify the path to your zotero.sqlite file
+        "db_path": os.getenv("DB_PATH"),
+        "new_date_added": NEW_DATE_ADDED,
+        "title_name": TITLE_NAME,
+    }
+
+
+def __getattr__(name):
+    """Keeps `from zotero_info_update.config import config` working, loading it on first access."""
 
-# Create a dictionary to store the configuration for dependency injection
-config = {
-    "db_path": DB_PATH,
-    "new_date_added": NEW_DATE_ADDED,
-    "title_name": TITLE_NAME,
-}
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
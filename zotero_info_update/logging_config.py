@@ -10,15 +10,21 @@ Classes:
     ColorFormatter(logging.Formatter):
         A custom logging formatter that adds ANSI color codes to log levels based on the log severity.
 
+Functions:
+    configure_logging():
+        Configures the root logger with the colored formatter. Call it once from the entry point.
+
 Usage:
-    Import this module to enable colored logging for DEBUG, INFO, WARNING, ERROR, and CRITICAL levels.
+    Call `configure_logging()` to enable colored logging for DEBUG, INFO, WARNING, ERROR, and CRITICAL levels.
     The color-coded logs help easily distinguish between different severity levels during debugging 
-    and monitoring.
+    and monitoring. Importing the module has no side effects.
 
 Example:
     ```python
     import logging
-    import logging_config  # Import to configure logging with colors
+    from logging_config import configure_logging
+
+    configure_logging()  # Configure logging with colors
 
     logger = logging.getLogger(__name__)
     logger.info("This is an info message.")
@@ -65,7 +71,3 @@ def configure_logging():
     handler = logging.StreamHandler()
     handler.setFormatter(formatter)
     logging.basicConfig(level=logging.DEBUG, handlers=[handler])
-
-
-# Configure logging when the module is imported
-configure_logging()
@@ -18,7 +18,7 @@ Exception Handling:
     Any unexpected errors encountered during the execution are caught, logged with detailed information, and re-raised for further handling.
 
 Configuration:
-    The script expects the `config` object (which contains the SQLite database path, new date to update, and title name) to be imported from the `zotero_info_update.config` module.
+    The script expects the configuration (which contains the SQLite database path, new date to update, and title name) to be returned by `get_config()` from the `zotero_info_update.config` module.
 
 Example:
     Running this script will automatically perform the update:
@@ -27,21 +27,24 @@ Example:
 Dependencies:
     - `zotero_info_update.zotero_info_update`: The main module responsible for database interactions.
     - `zotero_info_update.config`: The configuration module containing the database path, title name, and new date.
-    - `zotero_info_update.logging_config`: A module for configuring logging settings (may be used for setup).
+    - `zotero_info_update.logging_config`: A module for configuring logging settings, set up once via `configure_logging()`.
 """  # pylint: disable=line-too-long
 
 if __name__ == "__main__":
     import logging
     from zotero_info_update.zotero_info_update import ZoteroInfoUpdate
-    from zotero_info_update.config import config
-    import zotero_info_update.logging_config  # pylint: disable=unused-import
+    from zotero_info_update.config import get_config
+    from zotero_info_update.logging_config import configure_logging
+
+    configure_logging()
 
     my_logger = logging.getLogger(__name__)
     my_logger.setLevel(logging.INFO)
     my_logger.info("Starting the ZoteroUpdateDateAdded script...")
 
+    conn = None  # pylint: disable=invalid-name
     try:
-        zotero_update_date_added = ZoteroInfoUpdate(config)
+        zotero_update_date_added = ZoteroInfoUpdate(get_config())
         my_logger.debug("Connecting to the database...")
 
         conn = zotero_update_date_added.connect_to_db()
@@ -57,9 +60,9 @@ if __name__ == "__main__":
         # itemId = zotero_update_date_added.get_item_id(conn)
         # my_logger.debug("Item ID: %s", itemId)
 
-        # Update date added
-        zotero_update_date_added.update_date_added(conn)
-        my_logger.info("Date added updated successfully.")
+        # Update date added, reusing the item ID fetched above
+        if zotero_update_date_added.update_date_added(conn, itemId):
+            my_logger.info("Date added updated successfully.")
 
     except Exception as e:
         my_logger.error("An unexpected error occurred: %s", str(e), exc_info=True)
@@ -67,5 +70,5 @@ if __name__ == "__main__":
 
     finally:
         if conn:
-            conn.close()
-            my_logger.debug("Database connection closed.")
+            zotero_update_date_added.close_db(conn)
+            my_logger.info("Database connection closed.")
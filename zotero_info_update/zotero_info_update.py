@@ -16,13 +16,17 @@ Usage:
         - `title_name`: The title name to search for in the database.
     2. Call `connect_to_db()` to establish a connection to the database.
     3. Use `get_item_id(conn)` to fetch the item ID based on the provided title.
-    4. Call `update_date_added(conn)` to update the `dateAdded` field for the fetched item.
+    4. Call `update_date_added(conn, item_id)` to update the `dateAdded` field for the fetched item.
+    5. Call `close_db(conn)` to close the connection.
+
+Database Changes:
+    `connect_to_db()` adds a full-text search table, sync triggers and an index to the Zotero database the first time it runs, and switches the database to WAL journal mode. See `ZoteroInfoUpdate.ensure_search_schema` for the full list and how to undo it.
 
 Logging:
     The module uses Python's `logging` library to log information, errors, and other relevant events. The log level is set to `INFO`, and detailed error information is logged for any exceptions encountered.
 
 Exception Handling:
-    The class methods handle various SQLite-related errors such as `OperationalError`, `DatabaseError`, and `IntegrityError`. In case of unexpected errors, they are logged and re-raised for further handling.
+    Each class method logs any error raised by its database work with the full traceback and re-raises it for further handling. A `ValueError` is raised when no item matches the title.
 
 Example:
     config = {
@@ -34,6 +38,7 @@ Example:
     zotero_update = ZoteroInfoUpdate(config)
     conn = zotero_update.connect_to_db()
     zotero_update.update_date_added(conn)
+    zotero_update.close_db(conn)
 
 Author:
     Monireach Tang
@@ -47,12 +52,135 @@ Date:
 
 import sqlite3
 import logging
-import zotero_info_update.logging_config  # pylint: disable=unused-import
 
 # Configure logging
 my_logger = logging.getLogger(__name__)
 my_logger.setLevel(logging.INFO)
 
+# Bump whenever the statements in `_SEARCH_SCHEMA_SQL` change so existing databases pick them up
+_SEARCH_SCHEMA_VERSION = 1
+
+# Connection tuning applied right after connecting
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",  # Safe under WAL, and skips one fsync per commit
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",  # ~64 MB page cache
+    "PRAGMA mmap_size=268435456",  # Memory-map up to 256 MB of the database file
+)
+
+# FTS5 external-content table over `itemDataValues.value`, kept in sync by triggers. It indexes the
+# values of every field, although only title values are ever matched.
+_SEARCH_SCHEMA_SQL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS idv_fts USING fts5(
+        value, content='itemDataValues', content_rowid='valueID', tokenize='unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS idv_fts_ai AFTER INSERT ON itemDataValues BEGIN
+        INSERT INTO idv_fts(rowid, value) VALUES (new.valueID, new.value);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS idv_fts_ad AFTER DELETE ON itemDataValues BEGIN
+        INSERT INTO idv_fts(idv_fts, rowid, value) VALUES ('delete', old.valueID, old.value);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS idv_fts_au AFTER UPDATE ON itemDataValues BEGIN
+        INSERT INTO idv_fts(idv_fts, rowid, value) VALUES ('delete', old.valueID, old.value);
+        INSERT INTO idv_fts(rowid, value) VALUES (new.valueID, new.value);
+    END
+    """,
+    # Index the rows that existed before the triggers were attached
+    "INSERT INTO idv_fts(idv_fts) VALUES ('rebuild')",
+    # Covering index so the `itemDataValues` -> `itemData` join never reads `itemData` rows
+    "CREATE INDEX IF NOT EXISTS idx_itemData_value ON itemData(valueID, fieldID, itemID)",
+    # Collect planner statistics for the new indexes; `close_db` keeps them fresh with `PRAGMA optimize`
+    "ANALYZE",
+)
+
+# Title lookups consider Zotero's `title` field plus every field mapped onto it in
+# `baseFieldMappingsCombined`, since some item types store their title in a mapped field instead
+# (`caseName` for cases, `subject` for emails, `nameOfAct` for statutes). The `title` field is
+# resolved by name from the `fields` table rather than assuming its `fieldID`.
+_TITLE_FIELD_ID_SQL = "(SELECT fieldID FROM fields WHERE fieldName = 'title')"
+
+_TITLE_FIELDS_SQL = f"""(
+    SELECT fieldID FROM baseFieldMappingsCombined WHERE baseFieldID = {_TITLE_FIELD_ID_SQL}
+    UNION SELECT {_TITLE_FIELD_ID_SQL}
+)"""
+
+# Statements are built once as module-level constants; sqlite3's statement cache reuses the compiled query.
+# The raw title is bound and quoted as a single FTS5 phrase on the SQLite side, so its punctuation is
+# not parsed as query syntax and no pattern string is built in Python per call.
+# `itemData.valueID` has no type affinity, so the unary `+` is needed for SQLite to probe it through
+# `idx_itemData_value` by `(valueID, fieldID)`. The CROSS JOIN keeps the full-text match as the outer
+# loop instead of re-running it for every title row.
+_SELECT_ITEM_EXACT_SQL = f"""
+    SELECT id.itemID
+    FROM itemDataValues idv
+    INNER JOIN itemData id ON id.valueID = +idv.valueID
+    WHERE id.fieldID IN {_TITLE_FIELDS_SQL} AND idv.value = ?
+    LIMIT 1
+"""
+
+_SELECT_ITEM_SQL = f"""
+    SELECT id.itemID
+    FROM idv_fts f
+    CROSS JOIN itemData id ON id.valueID = +f.rowid
+    WHERE id.fieldID IN {_TITLE_FIELDS_SQL} AND idv_fts MATCH '"' || replace(?, '"', '""') || '"'
+    LIMIT 1
+"""
+
+# Last resort for partial words, which FTS5 only matches as whole tokens; scans `itemDataValues`
+_SELECT_ITEM_LIKE_SQL = f"""
+    SELECT id.itemID
+    FROM itemDataValues idv
+    INNER JOIN itemData id ON id.valueID = +idv.valueID
+    WHERE id.fieldID IN {_TITLE_FIELDS_SQL} AND idv.value LIKE '%' || ? || '%'
+    LIMIT 1
+"""
+
+# `?1` is the new date, reused so rows that already hold it are not rewritten; `?2` is the item ID or title.
+# `IS NOT` rather than `<>` so a NULL date is still written and fails the NOT NULL constraint.
+_UPDATE_DATE_ADDED_SQL = (
+    "UPDATE items SET dateAdded = ?1 WHERE itemID = ?2 AND dateAdded IS NOT ?1"
+)
+
+_SELECT_ITEM_EXISTS_SQL = "SELECT 1 FROM items WHERE itemID = ?"
+
+# Same lookup order as `get_item_id` (exact match, full-text search, then LIKE), folded into one statement
+_UPDATE_DATE_ADDED_BY_TITLE_SQL = f"""
+    UPDATE items SET dateAdded = ?1
+    WHERE itemID = COALESCE(
+        (
+            SELECT id.itemID
+            FROM itemDataValues idv
+            INNER JOIN itemData id ON id.valueID = +idv.valueID
+            WHERE id.fieldID IN {_TITLE_FIELDS_SQL} AND idv.value = ?2
+            LIMIT 1
+        ),
+        (
+            SELECT id.itemID
+            FROM idv_fts f
+            CROSS JOIN itemData id ON id.valueID = +f.rowid
+            WHERE id.fieldID IN {_TITLE_FIELDS_SQL}
+                AND idv_fts MATCH '"' || replace(?2, '"', '""') || '"'
+            LIMIT 1
+        ),
+        (
+            SELECT id.itemID
+            FROM itemDataValues idv
+            INNER JOIN itemData id ON id.valueID = +idv.valueID
+            WHERE id.fieldID IN {_TITLE_FIELDS_SQL} AND idv.value LIKE '%' || ?2 || '%'
+            LIMIT 1
+        )
+    )
+    AND dateAdded IS NOT ?1
+"""
+
 
 class ZoteroInfoUpdate:
     """
@@ -67,8 +195,11 @@ class ZoteroInfoUpdate:
     Methods:
         __init__(cfg): Initializes the class with the provided configuration.
         connect_to_db(): Establish a connection to the SQLite database.
+        ensure_search_schema(conn): Creates the full-text search table used for title lookups.
         get_item_id(conn): Retrieves the item ID from the database based on the title name.
-        update_date_added(conn): Updates the date added for the item in the database.
+        update_date_added(conn, item_id=None): Updates the date added for the item in the database.
+        update_many(conn, pairs): Updates the date added for several items in one transaction.
+        close_db(conn): Refreshes the query planner statistics and closes the connection.
     """
 
     def __init__(self, cfg):
@@ -83,28 +214,65 @@ class ZoteroInfoUpdate:
         my_logger.debug("Database path: %s", self.db_path)
 
         # Connect to the SQLite database
+        conn = None
         try:
-            conn = sqlite3.connect(self.db_path)
+            # Transactions are opened explicitly with BEGIN instead of by the driver
+            conn = sqlite3.connect(
+                self.db_path, isolation_level=None, cached_statements=256
+            )
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self.ensure_search_schema(conn)
             return conn
 
-        except sqlite3.OperationalError as e:
-            my_logger.error("SQLite OperationalError: %s", e, exc_info=True)
+        except Exception:
+            my_logger.exception("Failed to connect to the database: %s", self.db_path)
+            if conn is not None:
+                conn.close()
             raise  # Re-raise the exception so the calling code knows the connection failed.
 
-        except (
-            sqlite3.DatabaseError
-        ) as e:  # Catches other sqlite3 database-related errors
-            my_logger.error("SQLite DatabaseError: %s", e, exc_info=True)
-            raise
+    def ensure_search_schema(self, conn):
+        """
+        Creates the FTS5 title search table and its sync triggers, once per database.
 
-        except Exception as e:
-            my_logger.error("An unexpected error occurred: %s", str(e), exc_info=True)
-            raise
+        The setup is skipped when `PRAGMA user_version` shows it has already been applied.
+
+        This permanently changes the Zotero database: it adds the `idv_fts` virtual table (and its
+        FTS5 shadow tables), the `idv_fts_ai`/`idv_fts_ad`/`idv_fts_au` triggers on `itemDataValues`,
+        the `idx_itemData_value` index, and sets `user_version`. The triggers then run whenever Zotero
+        itself writes an item field, so Zotero's bundled SQLite must be built with FTS5; if it is not,
+        its writes to `itemDataValues` fail with "no such module: fts5". Back up `zotero.sqlite` before
+        the first run. To undo the change, with Zotero closed, run:
+
+            DROP TRIGGER idv_fts_ai; DROP TRIGGER idv_fts_ad; DROP TRIGGER idv_fts_au;
+            DROP TABLE idv_fts; DROP INDEX idx_itemData_value; PRAGMA user_version = 0;
+
+        Args:
+            conn: The connection to the SQLite database.
+        """
+
+        (user_version,) = conn.execute("PRAGMA user_version").fetchone()
+        if user_version >= _SEARCH_SCHEMA_VERSION:
+            return
+
+        my_logger.debug("Creating title search index...")
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for statement in _SEARCH_SCHEMA_SQL:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {_SEARCH_SCHEMA_VERSION}")
+        my_logger.debug("Title search index created.")
 
     def get_item_id(self, conn):
         """
         Retrieves the item ID from the database based on the title name.
 
+        Only values of the `title` field, and of the fields mapped onto it such as `caseName`,
+        `subject` and `nameOfAct`, are searched. The title is first looked up by exact match,
+        which is a single index probe. The full-text search, which matches whole words in order, is
+        only used when that finds nothing, and a `LIKE` substring scan catches partial words such as
+        "Artiﬁcial Intell".
+
         Args:
             conn: The connection to the SQLite database.
 
@@ -113,13 +281,8 @@ class ZoteroInfoUpdate:
 
         Raises:
             ValueError: If the title name is None or empty.
-            sqlite3.OperationalError: If a database error occurs.
-            sqlite3.IntegrityError: If a database integrity error occurs.
-            sqlite3.ProgrammingError: If a programming error occurs.
-            sqlite3.InterfaceError: If a database interface error occurs.
-            sqlite3.DataError: If a database data error occurs.
-            sqlite3.DatabaseError: If a database-related error occurs.
             ValueError: If no matching item is found.
+            sqlite3.DatabaseError: If a database-related error occurs.
         """
 
         if not self.title_name:
@@ -127,120 +290,123 @@ class ZoteroInfoUpdate:
 
         try:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT i.itemID, id.valueID, idv.value, i.dateAdded, i.clientDateModified
-                FROM itemDataValues idv
-                INNER JOIN itemData id ON id.valueID = idv.valueID
-                INNER JOIN items i ON i.itemID = id.itemID
-                WHERE idv.value LIKE ?
-                """,
-                ("%" + self.title_name + "%",),
-            )
-
-            # Fetch and return results
-            results = cursor.fetchall()
 
-            if not results:
-                my_logger.error("No matching item found for title: %s", self.title_name)
-                raise ValueError(f"No matching item found for title: {self.title_name}")
+            # Fast path: exact title match through the UNIQUE index on `itemDataValues.value`
+            cursor.execute(_SELECT_ITEM_EXACT_SQL, (self.title_name,))
+            row = cursor.fetchone()
 
-            my_logger.info(
-                "Successfully fetched results for title: %s", self.title_name
-            )
-            my_logger.info(
-                "Results: %s", results[0]
-            )  # Sample Output: (53, 385, 'What are ethical frameworks?')
-            return results[0][0]
-
-        # except sqlite3.OperationalError as e:
-        #     my_logger.error("SQLite OperationalError: %s", e, exc_info=True)
-        #     raise  # Re-raise the exception so the calling code knows the connection failed.
-
-        # except sqlite3.IntegrityError as e:
-        #     my_logger.error("SQLite IntegrityError: %s", e, exc_info=True)
-        #     raise
-
-        # except sqlite3.ProgrammingError as e:
-        #     my_logger.error("SQLite ProgrammingError: %s", e, exc_info=True)
-        #     raise
-
-        # except sqlite3.InterfaceError as e:
-        #     my_logger.error("SQLite InterfaceError: %s", e, exc_info=True)
-        #     raise
-
-        # except sqlite3.DataError as e:
-        #     my_logger.error("SQLite DataError: %s", e, exc_info=True)
-        #     raise
-
-        except (
-            sqlite3.DatabaseError
-        ) as e:  # Catches other sqlite3 database-related errors
-            my_logger.error("SQLite DatabaseError: %s", e, exc_info=True)
-            raise
+            if row is None:
+                cursor.execute(_SELECT_ITEM_SQL, (self.title_name,))
+                row = cursor.fetchone()
 
-        except ValueError as e:
-            my_logger.error("ValueError: Invalid input - %s", e, exc_info=True)
-            raise
+            # Substring fallback for partial words the full-text search cannot match
+            if row is None:
+                cursor.execute(_SELECT_ITEM_LIKE_SQL, (self.title_name,))
+                row = cursor.fetchone()
 
-        except MemoryError as e:
-            my_logger.critical("MemoryError: Out of memory - %s", e, exc_info=True)
+        except Exception:
+            my_logger.exception("Failed to fetch item ID for title: %s", self.title_name)
             raise
 
-        except Exception as e:
-            my_logger.error("An unexpected error occurred: %s", str(e), exc_info=True)
-            raise
+        if row is None:
+            my_logger.error("No matching item found for title: %s", self.title_name)
+            raise ValueError(f"No matching item found for title: {self.title_name}")
 
-        finally:
-            my_logger.info("Database connection closed.")
+        if my_logger.isEnabledFor(logging.DEBUG):
+            my_logger.debug("Successfully fetched results for title: %s", self.title_name)
+            my_logger.debug("Results: %s", row)  # Sample Output: (53,)
+        return row[0]
 
-    def update_date_added(self, conn):
+    def update_date_added(self, conn, item_id=None):
         """
         Update the date added for the item in the database.
 
+        Without an `item_id` the item is located by title inside the UPDATE itself, so no separate
+        lookup is issued. The row is left untouched if it already holds the new date.
+
         Args:
             conn: The connection to the SQLite database.
+            item_id (int, optional): The item ID already fetched with `get_item_id`.
+
+        Returns:
+            bool: True if the row was written, False if it already held the new date.
 
         Raises:
-            ValueError: If the item ID is None or empty.
+            ValueError: If the title name is None or empty.
+            ValueError: If no matching item is found, or no item has the given `item_id`.
             sqlite3.DatabaseError: If a database-related error occurs.
-            ValueError: If an invalid input error occurs.
-            MemoryError: If an out-of-memory error occurs.
 
         """
 
-        item_id = self.get_item_id(conn)
+        if item_id is None and not self.title_name:
+            raise ValueError("Title name cannot be None or empty.")
+
+        try:
+            # Commits on success and rolls back on exception
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                if item_id is None:
+                    cursor = conn.execute(
+                        _UPDATE_DATE_ADDED_BY_TITLE_SQL,
+                        (self.new_date_added, self.title_name),
+                    )
+                else:
+                    cursor = conn.execute(
+                        _UPDATE_DATE_ADDED_SQL, (self.new_date_added, item_id)
+                    )
+
+        except Exception:
+            my_logger.exception("Failed to update date added for title: %s", self.title_name)
+            raise
+
+        if cursor.rowcount > 0:
+            return True
+
+        # Nothing was written: either the item already has the date, or the item does not exist
+        if item_id is None:
+            self.get_item_id(conn)  # Raises ValueError if no item matches
+        elif conn.execute(_SELECT_ITEM_EXISTS_SQL, (item_id,)).fetchone() is None:
+            my_logger.error("Item ID not found: %s", item_id)
+            raise ValueError(f"No item found with ID: {item_id}")
+
+        my_logger.info("Date added is already up to date for title: %s", self.title_name)
+        return False
+
+    def update_many(self, conn, pairs):
+        """
+        Update the date added for several items in a single transaction.
+
+        Args:
+            conn: The connection to the SQLite database.
+            pairs: An iterable of `(new_date_added, item_id)` tuples.
 
-        if not item_id:
-            my_logger.error("Item ID not found for title: %s", self.title_name)
+        Raises:
+            sqlite3.DatabaseError: If a database-related error occurs.
+        """
 
         try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                UPDATE items SET dateAdded = ? WHERE itemID = ?
-                """,
-                (self.new_date_added, item_id),
-            )
-            conn.commit()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(_UPDATE_DATE_ADDED_SQL, pairs)
 
-        except (
-            sqlite3.DatabaseError
-        ) as e:  # Catches other sqlite3 database-related errors
-            my_logger.error("SQLite DatabaseError: %s", e, exc_info=True)
+        except Exception:
+            my_logger.exception("Failed to update date added for multiple items")
             raise
 
-        except ValueError as e:
-            my_logger.error("ValueError: Invalid input - %s", e, exc_info=True)
-            raise
+    def close_db(self, conn):
+        """
+        Close the connection, running `PRAGMA optimize` first as SQLite recommends.
 
-        except MemoryError as e:
-            my_logger.critical("MemoryError: Out of memory - %s", e, exc_info=True)
-            raise
+        Args:
+            conn: The connection to the SQLite database.
+        """
+
+        try:
+            conn.execute("PRAGMA optimize")
 
-        except Exception as e:
-            my_logger.error("An unexpected error occurred: %s", str(e), exc_info=True)
+        except Exception:
+            my_logger.exception("Failed to optimize the database: %s", self.db_path)
             raise
 
         finally:
-            my_logger.info("Database connection closed.")
+            conn.close()